@@ -2,18 +2,26 @@ import os
 import sys
 import json
 import logging
-import asyncio
+import queue
+import random
 import requests
 import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from urllib.parse import urljoin
-import tkinter as tk
-from tkinter import messagebox, filedialog
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Any
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from tkinter import messagebox
+from tkinter import font as tkfont
 
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import tqdm
+import orjson
 
 
 class Config:
@@ -24,8 +32,22 @@ class Config:
     RESULTS_JSON_FILE: str = "dog_images_results.json"
     LOG_FORMAT: str = "%(asctime)s - %(levelname)s - %(message)s"
     LOG_LEVEL: str = "DEBUG"
+    LOG_DRAIN_INTERVAL_MS: int = 100
+    LOG_DRAIN_MAX_LINES: int = 500
     REQUEST_TIMEOUT: int = 30
+    RESULTS_PAGE_SIZE: int = 500
+    USER_AGENT: str = "dog-images-downloader/1.0"
+    DOG_API_WORKERS: int = 16
+    UPLOAD_WORKERS: int = 16
     CONFIG_FILE: str = "app_config.json"
+    TOKEN_CHECK_TTL: int = 600
+    REMOTE_UPLOAD_FALLBACK_STATUSES: tuple = (400, 409, 413)
+    HTTP_POOL_CONNECTIONS: int = 2
+    HTTP_POOL_MAXSIZE: int = 32
+    HTTP_RETRY_TOTAL: int = 4
+    HTTP_RETRY_BACKOFF: float = 0.4
+    HTTP_RETRY_STATUSES: tuple = (429, 500, 502, 503, 504)
+    HTTP_RETRY_METHODS: frozenset = frozenset(['GET', 'PUT', 'POST'])
 
 
 def load_config():
@@ -51,18 +73,131 @@ def save_config():
         logging.warning(f"Не удалось сохранить конфигурацию: {e}")
 
 
+_http_session: Optional[requests.Session] = None
+_upload_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def create_http_session() -> requests.Session:
+    retry = Retry(
+        total=Config.HTTP_RETRY_TOTAL,
+        backoff_factor=Config.HTTP_RETRY_BACKOFF,
+        status_forcelist=Config.HTTP_RETRY_STATUSES,
+        allowed_methods=Config.HTTP_RETRY_METHODS,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    dog_api_adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=Config.DOG_API_WORKERS,
+        pool_block=True,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.headers.update({
+        'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+        'Connection': 'keep-alive',
+        'User-Agent': Config.USER_AGENT
+    })
+    session.mount('https://', adapter)
+    session.mount(Config.DOG_API_BASE_URL, dog_api_adapter)
+    return session
+
+
+def create_upload_session() -> requests.Session:
+    retry = Retry(
+        total=Config.HTTP_RETRY_TOTAL,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=Config.HTTP_RETRY_BACKOFF,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.UPLOAD_WORKERS,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.headers.update({
+        'Connection': 'keep-alive',
+        'User-Agent': Config.USER_AGENT
+    })
+    session.mount('https://', adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = create_http_session()
+        return _http_session
+
+
+def get_upload_session() -> requests.Session:
+    global _upload_session
+    with _http_session_lock:
+        if _upload_session is None:
+            _upload_session = create_upload_session()
+        return _upload_session
+
+
+def close_http_session() -> None:
+    global _http_session, _upload_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+        if _upload_session is not None:
+            _upload_session.close()
+            _upload_session = None
+
+
+class ImageData(NamedTuple):
+    breed: str
+    sub_breed: Optional[str]
+    image_url: str
+    breed_full_name: str
+
+
+@dataclass
+class UploadResult:
+    __slots__ = ('breed', 'sub_breed', 'breed_full_name', 'source_url', 'filename',
+                 'disk_path', 'upload_status', 'upload_info', 'timestamp')
+    breed: str
+    sub_breed: Optional[str]
+    breed_full_name: str
+    source_url: str
+    filename: str
+    disk_path: str
+    upload_status: str
+    upload_info: Optional[Dict[str, Any]]
+    timestamp: str
+
+
 class DogAPI:
     def __init__(self):
         self.base_url = Config.DOG_API_BASE_URL
         self.timeout = Config.REQUEST_TIMEOUT
+        self.session = get_http_session()
+        self._pending_futures = set()
+    
+    def cancel_pending(self) -> None:
+        for future in list(self._pending_futures):
+            future.cancel()
     
     def get_all_breeds(self) -> Dict[str, List[str]]:
         try:
             url = f"{self.base_url}/breeds/list/all"
-            response = requests.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get('status') != 'success':
                 raise ValueError(f"API вернул статус: {data.get('status')}")
             
@@ -86,10 +221,10 @@ class DogAPI:
                 url = f"{self.base_url}/breed/{breed}/images/random"
                 breed_name = breed
             
-            response = requests.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             if data.get('status') != 'success':
                 logging.warning(f"API вернул статус '{data.get('status')}' для породы {breed_name}")
                 return None
@@ -109,42 +244,114 @@ class DogAPI:
             logging.error(f"Ошибка в данных API для породы {breed_name}: {e}")
             return None
     
-    def get_breed_images_data(self, breeds: Dict[str, List[str]], progress_callback=None) -> List[Dict]:
-        images_data = []
-        total_operations = sum(max(1, len(sub_breeds)) for sub_breeds in breeds.values())
-        current_operation = 0
-        
-        for breed, sub_breeds in breeds.items():
-            if sub_breeds:
-                for sub_breed in sub_breeds:
-                    image_url = self.get_breed_image(breed, sub_breed)
-                    if image_url:
-                        images_data.append({
-                            'breed': breed,
-                            'sub_breed': sub_breed,
-                            'image_url': image_url,
-                            'breed_full_name': f"{breed}_{sub_breed}"
-                        })
-                    
-                    current_operation += 1
-                    if progress_callback:
-                        progress_callback(current_operation, total_operations, f"Получение URL для {breed}/{sub_breed}")
-            else:
-                image_url = self.get_breed_image(breed)
-                if image_url:
-                    images_data.append({
-                        'breed': breed,
-                        'sub_breed': None,
-                        'image_url': image_url,
-                        'breed_full_name': breed
-                    })
+    def get_sub_breed_images(self, breed: str, sub_breeds: List[str]) -> Dict[str, Optional[str]]:
+        # /breed/{breed}/images/random/{n} samples the whole breed and does not
+        # stratify by sub-breed, so one full /breed/{breed}/images listing is
+        # fetched instead and a random image is picked from each sub-breed folder.
+        # Sub-breeds missing from the listing fall back to a per-sub-breed request.
+        images_by_folder = {}
+        try:
+            url = f"{self.base_url}/breed/{breed}/images"
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            
+            data = orjson.loads(response.content)
+            if data.get('status') != 'success':
+                raise ValueError(f"API вернул статус: {data.get('status')}")
+            
+            for image_url in data.get('message', []):
+                folder = urlsplit(image_url).path.rsplit('/', 2)[-2]
+                images_by_folder.setdefault(folder, []).append(image_url)
                 
-                current_operation += 1
-                if progress_callback:
-                    progress_callback(current_operation, total_operations, f"Получение URL для {breed}")
+        except requests.RequestException as e:
+            logging.warning(f"Не удалось получить список изображений породы {breed}: {e}")
+        except ValueError as e:
+            logging.warning(f"Ошибка в данных API для списка изображений породы {breed}: {e}")
+        
+        images = {}
+        for sub_breed in sub_breeds:
+            folder_images = images_by_folder.get(f"{breed}-{sub_breed}")
+            if folder_images:
+                images[sub_breed] = random.choice(folder_images)
+                logging.info(f"Получен URL изображения для породы {breed}/{sub_breed}")
+            else:
+                images[sub_breed] = self.get_breed_image(breed, sub_breed)
+        
+        return images
+    
+    def _get_breed_image_urls(self, breed: str, sub_breeds: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        if not sub_breeds:
+            return [(None, self.get_breed_image(breed))]
+        if len(sub_breeds) == 1:
+            return [(sub_breeds[0], self.get_breed_image(breed, sub_breeds[0]))]
+        return list(self.get_sub_breed_images(breed, sub_breeds).items())
+    
+    def _iter_breed_image_urls(
+        self,
+        breeds: Dict[str, List[str]],
+        executor: Optional[Executor] = None
+    ) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ThreadPoolExecutor(max_workers=Config.DOG_API_WORKERS)
+        
+        futures = {
+            executor.submit(self._get_breed_image_urls, breed, sub_breeds): breed
+            for breed, sub_breeds in breeds.items()
+        }
+        self._pending_futures.update(futures)
         
-        logging.info(f"Собрано {len(images_data)} изображений для загрузки")
-        return images_data
+        try:
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                breed = futures[future]
+                for sub_breed, image_url in future.result():
+                    yield breed, sub_breed, image_url
+        
+        finally:
+            for future in futures:
+                future.cancel()
+            self._pending_futures.difference_update(futures)
+            if owns_executor:
+                executor.shutdown()
+    
+    def iter_breed_images(
+        self,
+        breeds: Dict[str, List[str]],
+        executor: Optional[Executor] = None
+    ) -> Iterator[ImageData]:
+        for breed, sub_breed, image_url in self._iter_breed_image_urls(breeds, executor):
+            if image_url:
+                yield ImageData(
+                    breed=breed,
+                    sub_breed=sub_breed,
+                    image_url=image_url,
+                    breed_full_name=f"{breed}_{sub_breed}" if sub_breed else breed
+                )
+
+
+class RemoteUploadRejected(Exception):
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"Remote upload rejected with status {status_code}")
+        self.status_code = status_code
+
+
+class _CountingStream:
+    
+    def __init__(self, response: requests.Response, chunk_size: int = 64 * 1024):
+        self._response = response
+        self._chunk_size = chunk_size
+        content_length = response.headers.get('Content-Length')
+        if content_length and 'Content-Encoding' not in response.headers:
+            self.len = int(content_length)
+        self.bytes_read = 0
+    
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._response.iter_content(self._chunk_size):
+            self.bytes_read += len(chunk)
+            yield chunk
 
 
 class YandexDiskAPI:
@@ -156,18 +363,30 @@ class YandexDiskAPI:
             'Content-Type': 'application/json'
         }
         self.timeout = Config.REQUEST_TIMEOUT
+        self.session = get_http_session()
+        self.upload_session = get_upload_session()
+        self._known_folders = set()
+        self._pending_folders = {}
+        self._folders_lock = threading.Lock()
+        self.token_rejected = False
+    
+    def _track_auth(self, response: requests.Response) -> None:
+        if response.status_code == 401:
+            self.token_rejected = True
     
     def check_token(self) -> bool:
         try:
             url = self.base_url
             logging.debug(f"Проверка токена: URL={url}")
             
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            response = self.session.get(url, headers=self.headers, timeout=self.timeout)
             
             logging.debug(f"Token check response status: {response.status_code}")
+            self._track_auth(response)
             
             if response.status_code == 200:
                 logging.info("Токен Яндекс.Диска валиден")
+                self.token_rejected = False
                 return True
             else:
                 logging.error(f"Токен невалиден. Код ответа: {response.status_code}")
@@ -177,14 +396,45 @@ class YandexDiskAPI:
             logging.error(f"Ошибка при проверке токена: {e}")
             return False
     
+    def reset_known_folders(self) -> None:
+        self._known_folders.clear()
+    
+    def _forget_parent_folders(self, disk_path: str) -> None:
+        parent = disk_path.rpartition('/')[0]
+        while parent:
+            self._known_folders.discard(parent)
+            parent = parent.rpartition('/')[0]
+    
     def create_folder(self, path: str) -> bool:
+        if path in self._known_folders:
+            return True
+        
+        with self._folders_lock:
+            pending = self._pending_folders.get(path)
+            owner = pending is None
+            if owner:
+                pending = self._pending_folders[path] = Future()
+        
+        if not owner:
+            return pending.result()
+        
+        created = False
+        try:
+            created = self._put_folder(path)
+            return created
+        finally:
+            with self._folders_lock:
+                del self._pending_folders[path]
+            pending.set_result(created)
+    
+    def _put_folder(self, path: str) -> bool:
         try:
             url = f"{self.base_url}/resources"
             params = {'path': path}
             
             logging.debug(f"Создание папки: URL={url}, path={path}")
             
-            response = requests.put(
+            response = self.session.put(
                 url, 
                 headers=self.headers, 
                 params=params, 
@@ -192,12 +442,15 @@ class YandexDiskAPI:
             )
             
             logging.debug(f"Response status: {response.status_code}")
+            self._track_auth(response)
             
             if response.status_code == 201:
                 logging.info(f"Папка '{path}' создана успешно")
+                self._known_folders.add(path)
                 return True
             elif response.status_code == 409:
                 logging.info(f"Папка '{path}' уже существует")
+                self._known_folders.add(path)
                 return True
             else:
                 logging.error(f"Ошибка создания папки '{path}'. Код ответа: {response.status_code}")
@@ -209,24 +462,26 @@ class YandexDiskAPI:
     
     def upload_file_from_url(self, file_url: str, disk_path: str) -> Optional[Dict[str, Any]]:
         try:
-            remote_upload_result = self._upload_from_remote_url(file_url, disk_path)
-            if remote_upload_result:
-                return remote_upload_result
-            
+            return self._upload_from_remote_url(file_url, disk_path)
+        except RemoteUploadRejected as e:
+            logging.warning(f"Remote upload отклонен для '{disk_path}' (код {e.status_code}), загружаем через клиент")
+        
+        try:
             upload_url = self._get_upload_url(disk_path)
             if not upload_url:
                 return None
             
             logging.info(f"Скачивание файла из {file_url}")
-            file_response = requests.get(file_url, timeout=self.timeout)
-            file_response.raise_for_status()
-            
-            logging.info(f"Загрузка файла на Яндекс.Диск: {disk_path}")
-            upload_response = requests.put(
-                upload_url,
-                data=file_response.content,
-                timeout=self.timeout
-            )
+            with self.session.get(file_url, stream=True, timeout=self.timeout) as file_response:
+                file_response.raise_for_status()
+                file_stream = _CountingStream(file_response)
+                
+                logging.info(f"Загрузка файла на Яндекс.Диск: {disk_path}")
+                upload_response = self.upload_session.put(
+                    upload_url,
+                    data=file_stream,
+                    timeout=self.timeout
+                )
             
             if upload_response.status_code in [201, 202]:
                 logging.info(f"Файл '{disk_path}' загружен успешно")
@@ -234,7 +489,7 @@ class YandexDiskAPI:
                     'disk_path': disk_path,
                     'source_url': file_url,
                     'status': 'uploaded',
-                    'size': len(file_response.content)
+                    'size': file_stream.bytes_read
                 }
             else:
                 logging.error(f"Ошибка загрузки файла '{disk_path}'. Код ответа: {upload_response.status_code}")
@@ -254,7 +509,7 @@ class YandexDiskAPI:
             
             logging.debug(f"Remote upload: URL={url}, disk_path={disk_path}, source_url={source_url}")
             
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=self.headers,
                 params=params,
@@ -262,6 +517,7 @@ class YandexDiskAPI:
             )
             
             logging.debug(f"Remote upload response status: {response.status_code}")
+            self._track_auth(response)
             
             if response.status_code in [201, 202]:
                 logging.info(f"Файл '{disk_path}' загружен через remote upload")
@@ -271,8 +527,10 @@ class YandexDiskAPI:
                     'status': 'uploaded_remote',
                     'method': 'remote_upload'
                 }
+            elif response.status_code in Config.REMOTE_UPLOAD_FALLBACK_STATUSES:
+                raise RemoteUploadRejected(response.status_code)
             else:
-                logging.warning(f"Remote upload не удался для '{disk_path}'. Код: {response.status_code}")
+                logging.error(f"Remote upload не удался для '{disk_path}'. Код: {response.status_code}")
                 return None
                 
         except requests.RequestException as e:
@@ -284,24 +542,30 @@ class YandexDiskAPI:
             url = f"{self.base_url}/resources/upload"
             params = {'path': disk_path, 'overwrite': 'true'}
             
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=self.headers,
                 params=params,
                 timeout=self.timeout
             )
+            self._track_auth(response)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 upload_url = data.get('href')
                 return upload_url
             else:
+                if response.status_code in (404, 409):
+                    self._forget_parent_folders(disk_path)
                 logging.error(f"Ошибка получения URL для загрузки. Код ответа: {response.status_code}")
                 return None
                 
         except requests.RequestException as e:
             logging.error(f"Ошибка при получении URL для загрузки: {e}")
             return None
+        except ValueError as e:
+            logging.error(f"Ошибка в данных API при получении URL для загрузки: {e}")
+            return None
 
 
 def setup_logging(log_widget=None) -> None:
@@ -311,11 +575,24 @@ def setup_logging(log_widget=None) -> None:
         def __init__(self, text_widget):
             super().__init__()
             self.text_widget = text_widget
+            self._log_queue = queue.SimpleQueue()
+            self.text_widget.after(Config.LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
         
         def emit(self, record):
-            if self.text_widget:
-                msg = self.format(record)
-                self.text_widget.after(0, lambda: self._append_log(msg))
+            self._log_queue.put(self.format(record))
+        
+        def _drain_log_queue(self):
+            batch = []
+            try:
+                while len(batch) < Config.LOG_DRAIN_MAX_LINES:
+                    batch.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            if batch:
+                self._append_log('\n'.join(batch))
+            
+            self.text_widget.after(Config.LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
         
         def _append_log(self, msg):
             if self.text_widget:
@@ -342,8 +619,24 @@ def setup_logging(log_widget=None) -> None:
     )
 
 
+_now_iso_cache = [float('-inf'), '']
+
+
+def _now_iso_cached(resolution: float = 0.5) -> str:
+    now = time.monotonic()
+    if now - _now_iso_cache[0] >= resolution:
+        _now_iso_cache[:] = [now, datetime.now().isoformat()]
+    return _now_iso_cache[1]
+
+
+def file_timestamp() -> str:
+    now = datetime.now()
+    return f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+
+
+@lru_cache(maxsize=4096)
 def extract_filename_from_url(url: str) -> str:
-    return url.split('/')[-1]
+    return urlsplit(url).path.rsplit('/', 1)[-1]
 
 
 def create_filename(breed_name: str, image_url: str) -> str:
@@ -351,29 +644,56 @@ def create_filename(breed_name: str, image_url: str) -> str:
     return f"{breed_name}_{original_filename}"
 
 
-def save_results_to_json(results: List[Dict[str, Any]], filename: str) -> None:
+RESULTS_HEADER = "Порода\tПодпорода\tСтатус\tВремя\n"
+RESULTS_TAB_STOPS = (21, 37, 48)
+
+
+def format_result_row(result: UploadResult) -> str:
+    return (
+        f"{(result.breed or '')[:19]}\t"
+        f"{(result.sub_breed or '-')[:14]}\t"
+        f"{'OK' if result.upload_status == 'success' else 'ERR'}\t"
+        f"{(result.timestamp or '')[:19]}\n"
+    )
+
+
+def save_results_to_json(results: List[UploadResult], filename: str) -> bool:
     try:
-        json_data = {
-            'metadata': {
-                'created_at': datetime.now().isoformat(),
-                'total_images': len(results),
-                'successful_uploads': len([r for r in results if r.get('upload_status') == 'success']),
-                'failed_uploads': len([r for r in results if r.get('upload_status') == 'failed'])
-            },
-            'results': results
+        status_counts = Counter(r.upload_status for r in results)
+        metadata = {
+            'created_at': datetime.now().isoformat(),
+            'total_images': len(results),
+            'successful_uploads': status_counts['success'],
+            'failed_uploads': status_counts['failed']
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(b'{\n  "metadata": ')
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+            f.write(b',\n  "results": [')
+            
+            separator = b'\n    '
+            for result in results:
+                f.write(separator)
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n    '))
+                separator = b',\n    '
+            
+            f.write(b'\n  ]\n}\n' if results else b']\n}\n')
         
         logging.info(f"Результаты сохранены в файл: {filename}")
+        return True
         
     except Exception as e:
         logging.error(f"Ошибка при сохранении результатов в JSON: {e}")
+        return False
 
 
 class DogImagesDownloaderGUI:
     
+    _TITLE_FONT = None
+    _STATS_FONT = None
+    _MONO_FONT = None
+    
     def __init__(self):
         
         load_config()
@@ -388,10 +708,40 @@ class DogImagesDownloaderGUI:
         
         self.is_running = False
         self.current_results = []
+        self._formatted_results_source = None
+        self._formatted_results = []
+        self._success_count = 0
+        self._failure_count = 0
+        
+        self._results_window = None
+        self._results_stats_label = None
+        self._results_text = None
+        self._results_source = []
+        self._results_rendered = 0
+        self._results_page_pending = False
+        self._results_shown_sig = None
+        
+        self._pending_ui = {}
+        self._ui_scheduled = False
+        self._ui_lock = threading.Lock()
+        self._applied_ui = {}
+        
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        self._export_in_progress = False
+        self._last_save_dir = None
+        self._download_future = None
+        self._upload_futures = {}
+        self._url_pool = ThreadPoolExecutor(max_workers=Config.DOG_API_WORKERS)
+        self._upload_pool = ThreadPoolExecutor(max_workers=Config.UPLOAD_WORKERS)
+        self._dog_api = DogAPI()
+        self._yandex_disk = None
+        self._token_validated_at = None
         
         self.create_widgets()
         self.setup_logging()
         
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         logging.info("GUI приложение инициализировано")
     
     def create_widgets(self):
@@ -558,8 +908,10 @@ class DogImagesDownloaderGUI:
         
         def check_in_thread():
             try:
-                yandex_disk = YandexDiskAPI(token)
+                yandex_disk = self._get_yandex_disk(token)
                 is_valid = yandex_disk.check_token()
+                if is_valid:
+                    self._token_validated_at = time.monotonic()
                 
                 self.root.after(0, lambda: self._token_check_result(is_valid))
                 
@@ -567,7 +919,15 @@ class DogImagesDownloaderGUI:
                 logging.error(f"Ошибка при проверке токена: {e}")
                 self.root.after(0, lambda: self._token_check_result(False))
         
-        threading.Thread(target=check_in_thread, daemon=True).start()
+        self._io_pool.submit(check_in_thread)
+    
+    def _get_yandex_disk(self, token: str) -> YandexDiskAPI:
+        yandex_disk = self._yandex_disk
+        if yandex_disk is None or yandex_disk.token != token:
+            yandex_disk = YandexDiskAPI(token)
+            self._yandex_disk = yandex_disk
+            self._token_validated_at = None
+        return yandex_disk
     
     def _token_check_result(self, is_valid: bool):
         self.check_token_btn.configure(text="Проверить токен", state="normal")
@@ -598,7 +958,10 @@ class DogImagesDownloaderGUI:
         self.start_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
         self.progress_bar.set(0)
+        self._applied_ui.clear()
         self.current_results = []
+        self._success_count = 0
+        self._failure_count = 0
         
         Config.YANDEX_DISK_TOKEN = token
         Config.BASE_FOLDER_NAME = folder_name
@@ -606,10 +969,14 @@ class DogImagesDownloaderGUI:
         
         logging.info("Начинаем загрузку изображений собак...")
         
-        threading.Thread(target=self._download_process, daemon=True).start()
+        self._download_future = self._io_pool.submit(self._download_process)
     
     def stop_download(self):
         self.is_running = False
+        if self._download_future is not None:
+            self._download_future.cancel()
+        self._flush_ui()
+        self._applied_ui.clear()
         self.start_btn.configure(state="normal")
         self.stop_btn.configure(state="disabled")
         self.progress_label.configure(text="Остановлено пользователем")
@@ -617,125 +984,121 @@ class DogImagesDownloaderGUI:
     
     def _download_process(self):
         try:
-            dog_api = DogAPI()
-            yandex_disk = YandexDiskAPI(Config.YANDEX_DISK_TOKEN)
+            dog_api = self._dog_api
+            yandex_disk = self._get_yandex_disk(Config.YANDEX_DISK_TOKEN)
+            yandex_disk.reset_known_folders()
             
-            if not yandex_disk.check_token():
-                self.root.after(0, lambda: self._download_finished(False, "Токен невалиден"))
-                return
+            validated_at = self._token_validated_at
+            if validated_at is None or time.monotonic() - validated_at >= Config.TOKEN_CHECK_TTL:
+                if not yandex_disk.check_token():
+                    self.root.after(0, lambda: self._download_finished(False, "Токен невалиден"))
+                    return
+                self._token_validated_at = time.monotonic()
             
-            self.root.after(0, lambda: self.progress_label.configure(text="Получение списка пород..."))
+            self._queue_ui(status="Получение списка пород...")
             breeds = dog_api.get_all_breeds()
             
             if not self.is_running:
                 return
             
             total_breeds = len(breeds)
-            self.root.after(0, lambda: self.stats_breeds.configure(text=f"Пород: {total_breeds}"))
+            self._queue_ui(breeds=total_breeds)
             
             base_folder = Config.BASE_FOLDER_NAME
-            self.root.after(0, lambda: self.progress_label.configure(text=f"Создание папки {base_folder}..."))
+            self._queue_ui(status=f"Создание папки {base_folder}...")
             
             if not yandex_disk.create_folder(base_folder):
+                if yandex_disk.token_rejected:
+                    self._token_validated_at = None
+                    self.root.after(0, lambda: self._download_finished(False, "Токен невалиден"))
+                    return
                 self.root.after(0, lambda: self._download_finished(False, "Не удалось создать базовую папку"))
                 return
             
             if not self.is_running:
                 return
             
-            self.root.after(0, lambda: self.progress_label.configure(text="Получение URLs изображений..."))
-            
-            def progress_callback(current, total, status):
-                if self.is_running:
-                    progress = current / total
-                    self.root.after(0, lambda: self.progress_bar.set(progress))
-                    self.root.after(0, lambda: self.progress_label.configure(text=f"{status} ({current}/{total})"))
-            
-            images_data = dog_api.get_breed_images_data(breeds, progress_callback)
-            
-            if not self.is_running:
-                return
-            
-            if not images_data:
-                self.root.after(0, lambda: self._download_finished(False, "Не удалось получить изображения"))
-                return
+            self._queue_ui(status="Получение URLs изображений...")
             
             results = []
             successful_uploads = 0
             failed_uploads = 0
             
-            breeds_folders = {}
-            for img_data in images_data:
-                breed_folder = img_data['breed']
-                if breed_folder not in breeds_folders:
-                    breeds_folders[breed_folder] = []
-                breeds_folders[breed_folder].append(img_data)
-            
-            total_images = len(images_data)
+            total_images = sum(max(1, len(sub_breeds)) for sub_breeds in breeds.values())
             current_image = 0
             
-            for breed_name, breed_images in breeds_folders.items():
-                if not self.is_running:
-                    break
+            futures = self._upload_futures = {}
+            completed = queue.SimpleQueue()
+            
+            def produce_uploads():
+                image_stream = dog_api.iter_breed_images(breeds, self._url_pool)
+                try:
+                    for img_data in image_stream:
+                        if not self.is_running or yandex_disk.token_rejected:
+                            break
+                        
+                        future = self._upload_pool.submit(self._upload_image, yandex_disk, img_data, base_folder)
+                        futures[future] = img_data
+                        future.add_done_callback(completed.put)
+                
+                except Exception as e:
+                    logging.error(f"Ошибка при получении URLs изображений: {e}")
+                finally:
+                    image_stream.close()
+                    completed.put(None)
+            
+            threading.Thread(target=produce_uploads, daemon=True).start()
+            
+            producer_done = False
+            while not producer_done or current_image < len(futures):
+                future = completed.get()
+                if future is None:
+                    producer_done = True
+                    continue
                 
-                breed_folder_path = f"{base_folder}/{breed_name}"
-                if not yandex_disk.create_folder(breed_folder_path):
-                    logging.error(f"Не удалось создать папку для породы {breed_name}")
+                current_image += 1
+                if not self.is_running or yandex_disk.token_rejected:
+                    for pending in list(futures):
+                        pending.cancel()
                     continue
                 
-                for img_data in breed_images:
-                    if not self.is_running:
-                        break
+                img_data = futures[future]
+                
+                try:
+                    result = future.result()
+                    results.append(result)
                     
-                    try:
-                        current_image += 1
-                        progress = current_image / total_images
-                        
-                        filename = create_filename(img_data['breed_full_name'], img_data['image_url'])
-                        disk_path = f"{breed_folder_path}/{filename}"
-                        
-                        status_text = f"Загрузка {img_data['breed_full_name']} ({current_image}/{total_images})"
-                        self.root.after(0, lambda p=progress, s=status_text: [
-                            self.progress_bar.set(p),
-                            self.progress_label.configure(text=s)
-                        ])
-                        
-                        upload_result = yandex_disk.upload_file_from_url(img_data['image_url'], disk_path)
-                        
-                        result = {
-                            'breed': img_data['breed'],
-                            'sub_breed': img_data['sub_breed'],
-                            'breed_full_name': img_data['breed_full_name'],
-                            'source_url': img_data['image_url'],
-                            'filename': filename,
-                            'disk_path': disk_path,
-                            'upload_status': 'success' if upload_result else 'failed',
-                            'upload_info': upload_result,
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        
-                        results.append(result)
-                        
-                        if upload_result:
-                            successful_uploads += 1
-                        else:
-                            failed_uploads += 1
-                        
-                        self.root.after(0, lambda s=successful_uploads, f=failed_uploads: [
-                            self.stats_uploaded.configure(text=f"Загружено: {s}"),
-                            self.stats_failed.configure(text=f"Ошибок: {f}")
-                        ])
-                        
-                    except Exception as e:
-                        logging.error(f"Ошибка при обработке изображения {img_data['image_url']}: {e}")
+                    if result.upload_status == 'success':
+                        successful_uploads += 1
+                    else:
                         failed_uploads += 1
-                        self.root.after(0, lambda f=failed_uploads: self.stats_failed.configure(text=f"Ошибок: {f}"))
+                    
+                except Exception as e:
+                    logging.error(f"Ошибка при обработке изображения {img_data.image_url}: {e}")
+                    failed_uploads += 1
+                
+                status_text = f"Загрузка {img_data.breed_full_name} ({current_image}/{total_images})"
+                self._queue_ui(
+                    progress=current_image / total_images,
+                    status=status_text,
+                    uploaded=successful_uploads,
+                    failed=failed_uploads
+                )
+            
+            if not futures and self.is_running and not yandex_disk.token_rejected:
+                self.root.after(0, lambda: self._download_finished(False, "Не удалось получить изображения"))
+                return
             
             if results:
                 self.current_results = results
+                self._success_count = successful_uploads
+                self._failure_count = len(results) - successful_uploads
                 save_results_to_json(results, Config.RESULTS_JSON_FILE)
             
-            if self.is_running:
+            if yandex_disk.token_rejected:
+                self._token_validated_at = None
+                self.root.after(0, lambda: self._download_finished(False, "Токен отклонен Яндекс.Диском"))
+            elif self.is_running:
                 success_message = f"Загрузка завершена!\nУспешно: {successful_uploads}\nОшибок: {failed_uploads}"
                 self.root.after(0, lambda: self._download_finished(True, success_message))
             
@@ -743,7 +1106,65 @@ class DogImagesDownloaderGUI:
             logging.error(f"Критическая ошибка в процессе загрузки: {e}")
             self.root.after(0, lambda: self._download_finished(False, f"Критическая ошибка: {e}"))
     
+    def _upload_image(self, yandex_disk: YandexDiskAPI, img_data: ImageData, base_folder: str) -> UploadResult:
+        breed, sub_breed, image_url, breed_full_name = img_data
+        
+        breed_folder_path = f"{base_folder}/{breed}"
+        filename = create_filename(breed_full_name, image_url)
+        disk_path = f"{breed_folder_path}/{filename}"
+        
+        if yandex_disk.create_folder(breed_folder_path):
+            upload_result = yandex_disk.upload_file_from_url(image_url, disk_path)
+        else:
+            logging.error(f"Не удалось создать папку для породы {breed}")
+            upload_result = None
+        
+        return UploadResult(
+            breed=breed,
+            sub_breed=sub_breed,
+            breed_full_name=breed_full_name,
+            source_url=image_url,
+            filename=filename,
+            disk_path=disk_path,
+            upload_status='success' if upload_result else 'failed',
+            upload_info=upload_result,
+            timestamp=_now_iso_cached()
+        )
+    
+    def _queue_ui(self, **updates):
+        with self._ui_lock:
+            self._pending_ui.update(updates)
+            if self._ui_scheduled:
+                return
+            self._ui_scheduled = True
+        
+        self.root.after(50, self._flush_ui)
+    
+    def _flush_ui(self):
+        with self._ui_lock:
+            pending = self._pending_ui
+            self._pending_ui = {}
+            self._ui_scheduled = False
+        
+        for key, value in pending.items():
+            if self._applied_ui.get(key) == value:
+                continue
+            self._applied_ui[key] = value
+            
+            if key == 'progress':
+                self.progress_bar.set(value)
+            elif key == 'status':
+                self.progress_label.configure(text=value)
+            elif key == 'breeds':
+                self.stats_breeds.configure(text=f"Пород: {value}")
+            elif key == 'uploaded':
+                self.stats_uploaded.configure(text=f"Загружено: {value}")
+            elif key == 'failed':
+                self.stats_failed.configure(text=f"Ошибок: {value}")
+    
     def _download_finished(self, success: bool, message: str):
+        self._flush_ui()
+        self._applied_ui.clear()
         self.is_running = False
         self.start_btn.configure(state="normal")
         self.stop_btn.configure(state="disabled")
@@ -765,14 +1186,18 @@ class DogImagesDownloaderGUI:
         logging.info("Логи очищены")
     
     def save_logs(self):
+        from tkinter import filedialog
+        
         try:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".log",
                 filetypes=[("Log files", "*.log"), ("Text files", "*.txt"), ("All files", "*.*")],
-                initialfile=f"dog_downloader_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+                initialfile=f"dog_downloader_logs_{file_timestamp()}.log",
+                initialdir=self._last_save_dir
             )
             
             if filename:
+                self._last_save_dir = os.path.dirname(filename)
                 logs = self.log_textbox.get('1.0', 'end')
                 with open(filename, 'w', encoding='utf-8') as f:
                     f.write(logs)
@@ -789,50 +1214,66 @@ class DogImagesDownloaderGUI:
             messagebox.showinfo("Информация", "Нет результатов для отображения.\nСначала запустите загрузку.")
             return
         
+        results_sig = (id(self.current_results), len(self.current_results))
+        
+        if self._results_window is None or not self._results_window.winfo_exists():
+            self._create_results_window()
+        else:
+            self._results_window.deiconify()
+            self._results_window.lift()
+            if results_sig == self._results_shown_sig:
+                return
+        
+        self._populate_results_window()
+        self._results_shown_sig = results_sig
+    
+    def _create_results_window(self):
+        title_font, stats_font, mono_font = self._get_results_fonts()
+        
         results_window = ctk.CTkToplevel(self.root)
         results_window.title("Результаты загрузки")
         results_window.geometry("800x600")
+        results_window.protocol("WM_DELETE_WINDOW", results_window.withdraw)
         
         title_label = ctk.CTkLabel(
             results_window, 
             text="Результаты загрузки", 
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=title_font
         )
         title_label.pack(pady=10)
         
         stats_frame = ctk.CTkFrame(results_window)
         stats_frame.pack(fill="x", padx=10, pady=5)
         
-        total = len(self.current_results)
-        successful = len([r for r in self.current_results if r.get('upload_status') == 'success'])
-        failed = total - successful
-        
-        stats_text = f"Всего: {total} | Успешно: {successful} | Ошибок: {failed}"
-        stats_label = ctk.CTkLabel(stats_frame, text=stats_text, font=ctk.CTkFont(size=14))
-        stats_label.pack(pady=10)
+        self._results_stats_label = ctk.CTkLabel(stats_frame, text="", font=stats_font)
+        self._results_stats_label.pack(pady=10)
         
         results_frame = ctk.CTkFrame(results_window)
         results_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
-        results_text = ctk.CTkTextbox(results_frame, font=ctk.CTkFont(family="Consolas", size=10))
-        results_text.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        header = f"{'Порода':<20} {'Подпорода':<15} {'Статус':<10} {'Время':<20}\n"
-        separator = "-" * 80 + "\n"
-        
-        results_text.insert('end', header)
-        results_text.insert('end', separator)
-        
-        for result in self.current_results:
-            breed = result.get('breed', '')[:19]
-            sub_breed = result.get('sub_breed', '')[:14] if result.get('sub_breed') else '-'
-            status = 'OK' if result.get('upload_status') == 'success' else 'ERR'
-            timestamp = result.get('timestamp', '')[:19] if result.get('timestamp') else ''
-            
-            line = f"{breed:<20} {sub_breed:<15} {status:<10} {timestamp:<20}\n"
-            results_text.insert('end', line)
+        header_text = ctk.CTkTextbox(
+            results_frame,
+            font=mono_font,
+            height=28,
+            wrap="none",
+            activate_scrollbars=False
+        )
+        header_text.pack(fill="x", padx=10, pady=(10, 0))
+        header_text.insert('end', RESULTS_HEADER.rstrip('\n'))
+        header_text.configure(state='disabled')
+        
+        self._results_text = ctk.CTkTextbox(
+            results_frame,
+            font=mono_font,
+            wrap="none"
+        )
+        self._results_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self._results_text.configure(yscrollcommand=self._on_results_yscroll)
         
-        results_text.configure(state='disabled')
+        char_width = tkfont.Font(font=self._results_text._textbox.cget('font')).measure('0')
+        tabs = tuple(stop * char_width for stop in RESULTS_TAB_STOPS)
+        header_text.configure(tabs=tabs)
+        self._results_text.configure(tabs=tabs)
         
         buttons_frame = ctk.CTkFrame(results_window)
         buttons_frame.pack(fill="x", padx=10, pady=5)
@@ -840,7 +1281,7 @@ class DogImagesDownloaderGUI:
         close_btn = ctk.CTkButton(
             buttons_frame,
             text="Закрыть",
-            command=results_window.destroy,
+            command=results_window.withdraw,
             width=100
         )
         close_btn.pack(side="right", padx=5, pady=5)
@@ -852,22 +1293,107 @@ class DogImagesDownloaderGUI:
             width=120
         )
         export_btn.pack(side="right", padx=5, pady=5)
+        
+        self._results_window = results_window
+    
+    def _populate_results_window(self):
+        self._results_source = self.current_results
+        total = len(self._results_source)
+        successful = self._success_count
+        failed = self._failure_count
+        
+        stats_text = f"Всего: {total} | Успешно: {successful} | Ошибок: {failed}"
+        self._results_stats_label.configure(text=stats_text)
+        
+        self._results_rendered = 0
+        self._results_page_pending = False
+        
+        self._results_text.configure(state='normal')
+        self._results_text.delete('1.0', 'end')
+        self._render_next_results_page(editable=True)
+    
+    def _render_next_results_page(self, editable: bool = False):
+        start = self._results_rendered
+        rows = self._get_formatted_results(start, start + Config.RESULTS_PAGE_SIZE)
+        self._results_rendered += len(rows)
+        self._results_page_pending = False
+        
+        if not editable:
+            self._results_text.configure(state='normal')
+        self._results_text.insert('end', ''.join(rows))
+        self._results_text.configure(state='disabled')
+    
+    def _on_results_yscroll(self, first, last):
+        self._results_text._y_scrollbar.set(first, last)
+        if (float(last) >= 0.9
+                and self._results_rendered < len(self._results_source)
+                and not self._results_page_pending):
+            self._results_page_pending = True
+            self._results_text.after_idle(self._render_next_results_page)
+    
+    @classmethod
+    def _get_results_fonts(cls):
+        if cls._TITLE_FONT is None:
+            cls._TITLE_FONT = ctk.CTkFont(size=20, weight="bold")
+            cls._STATS_FONT = ctk.CTkFont(size=14)
+            cls._MONO_FONT = ctk.CTkFont(family="Consolas", size=10)
+        return cls._TITLE_FONT, cls._STATS_FONT, cls._MONO_FONT
+    
+    def _get_formatted_results(self, start: int, end: int) -> List[str]:
+        if self._formatted_results_source is not self._results_source:
+            self._formatted_results_source = self._results_source
+            self._formatted_results = []
+        
+        formatted = self._formatted_results
+        if len(formatted) < end:
+            formatted.extend(format_result_row(r) for r in self._results_source[len(formatted):end])
+        
+        return formatted[start:end]
     
     def _export_results(self):
+        if self._export_in_progress:
+            messagebox.showinfo("Информация", "Экспорт уже выполняется")
+            return
+        
+        from tkinter import filedialog
+        
         try:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".json",
                 filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-                initialfile=f"dog_images_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                initialfile=f"dog_images_results_{file_timestamp()}.json",
+                initialdir=self._last_save_dir
             )
             
             if filename:
-                save_results_to_json(self.current_results, filename)
-                messagebox.showinfo("Успех", f"Результаты экспортированы в:\n{filename}")
+                self._last_save_dir = os.path.dirname(filename)
+                self._export_in_progress = True
+                self._io_pool.submit(self._do_export, self._results_source, filename)
         
         except Exception as e:
+            self._export_in_progress = False
             messagebox.showerror("Ошибка", f"Не удалось экспортировать результаты:\n{e}")
     
+    def _do_export(self, results: List[UploadResult], filename: str):
+        try:
+            if save_results_to_json(results, filename):
+                self.root.after(0, lambda: messagebox.showinfo("Успех", f"Результаты экспортированы в:\n{filename}"))
+            else:
+                self.root.after(0, lambda: messagebox.showerror("Ошибка", f"Не удалось экспортировать результаты в:\n{filename}\nПодробности в логе."))
+        finally:
+            self._export_in_progress = False
+    
+    def on_close(self):
+        self.is_running = False
+        self._dog_api.cancel_pending()
+        for future in list(self._upload_futures):
+            future.cancel()
+        self._url_pool.shutdown(wait=False)
+        self._upload_pool.shutdown(wait=False)
+        self._io_pool.shutdown(wait=False)
+        close_http_session()
+        self.root.destroy()
+    
     def run(self):
         try:
             logging.info("Запуск GUI приложения")
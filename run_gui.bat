@@ -10,7 +10,7 @@ if errorlevel 1 (
     exit /b 1
 )
 
-python -c "import requests, customtkinter" >nul 2>&1
+python -c "import requests, customtkinter, orjson" >nul 2>&1
 if errorlevel 1 (
     echo Installing dependencies...
     pip install -r requirements.txt